@@ -5,29 +5,70 @@
  * to create intelligent task schedules via Slack commands.
  */
 
+const cluster = require('cluster');
 const { App } = require('@slack/bolt');
 const config = require('./config');
+const logger = require('./logger');
 const nimService = require('./nim-service');
+const responseCache = require('./cache');
 const slackService = require('./slack-service');
+const messageBatcher = require('./message-batcher');
+const { rateLimit } = require('./rate-limit');
 const { parseScheduleCommand, validateInput } = require('./utils');
 
 // Initialize Slack app
+// Socket Mode keeps one WebSocket open to Slack; HTTP mode serves /slack/events
 const app = new App({
   token: config.slack.botToken,
-  signingSecret: config.slack.signingSecret,
-  socketMode: false, // Use HTTP mode for simplicity
-  port: config.port
+  ...(config.slack.socketMode
+    ? { appToken: config.slack.appToken, socketMode: true }
+    : { signingSecret: config.slack.signingSecret, socketMode: false, port: config.port })
+});
+
+// Listener work still in flight after ack(); shutdown() waits for it
+const backgroundTasks = new Set();
+
+/**
+ * Run slow listener work after ack() without holding the listener open
+ */
+function runInBackground(label, task) {
+  const pending = Promise.resolve()
+    .then(task)
+    .catch(error => logger.error('%s error:', label, error))
+    .finally(() => backgroundTasks.delete(pending));
+
+  backgroundTasks.add(pending);
+  return pending;
+}
+
+// Reject users over their request limits before any other work
+app.use(rateLimit);
+
+/**
+ * Log Slack retries so duplicate deliveries are visible
+ */
+app.use(async ({ context, next }) => {
+  if (context.retryNum) {
+    logger.info('🔁 Slack retry #%s (%s)', context.retryNum, context.retryReason || 'unknown reason');
+  }
+  await next();
 });
 
 /**
  * Handle /schedule slash command
  */
-app.command('/schedule', async ({ command, ack, say }) => {
-  // Acknowledge command immediately
+async function handleScheduleCommand({ command, ack, say }) {
+  // Acknowledge command immediately, then generate off the listener
   await ack();
+  runInBackground('Command', () => processScheduleCommand(command, say));
+}
 
+/**
+ * Generate and deliver a schedule for a /schedule command
+ */
+async function processScheduleCommand(command, say) {
   try {
-    console.log(`📅 Schedule request from ${command.user_id}: ${command.text}`);
+    logger.info('📅 Schedule request from %s: %s', command.user_id, command.text);
 
     // Parse and validate input
     const { timeframe, tasks, error } = parseScheduleCommand(command.text);
@@ -46,8 +87,20 @@ app.command('/schedule', async ({ command, ack, say }) => {
     const thinking = await say('🤖 Creating your optimized schedule...');
 
     try {
-      // Generate schedule using NIM
-      const schedule = await nimService.generateSchedule(timeframe, tasks);
+      // Generate schedule using NIM, updating the message only when another task is placed
+      let lastProgress = slackService.createProgressMessage('', tasks.length).text;
+      const onProgress = config.nim.stream ? async (content) => {
+        const progress = slackService.createProgressMessage(content, tasks.length);
+        if (progress.text === lastProgress) return;
+
+        lastProgress = progress.text;
+        await app.client.chat.update({
+          channel: command.channel_id,
+          ts: thinking.ts,
+          ...progress
+        });
+      } : undefined;
+      const schedule = await nimService.generateSchedule(timeframe, tasks, { onProgress });
 
       // Send formatted response
       await app.client.chat.update({
@@ -56,10 +109,10 @@ app.command('/schedule', async ({ command, ack, say }) => {
         ...slackService.createScheduleMessage(schedule, timeframe)
       });
 
-      console.log(`✅ Schedule generated successfully for ${command.user_id}`);
+      logger.info('✅ Schedule generated successfully for %s', command.user_id);
 
     } catch (nimError) {
-      console.error('NIM API Error:', nimError.message);
+      logger.error('NIM API Error:', nimError.message);
       
       await app.client.chat.update({
         channel: command.channel_id,
@@ -69,17 +122,27 @@ app.command('/schedule', async ({ command, ack, say }) => {
     }
 
   } catch (error) {
-    console.error('Command Error:', error);
+    logger.error('Command Error:', error);
     await say(slackService.createErrorMessage('An unexpected error occurred. Please try again.'));
   }
-});
+}
 
 /**
  * Handle /schedule-help command
  */
-app.command('/schedule-help', async ({ ack, say }) => {
+async function handleHelpCommand({ ack, say }) {
   await ack();
   await say(slackService.createHelpMessage());
+}
+
+// Slash commands dispatched by name from a single listener
+const commandHandlers = {
+  '/schedule': handleScheduleCommand,
+  '/schedule-help': handleHelpCommand
+};
+
+app.command(/^\/schedule(-help)?$/, async (args) => {
+  await commandHandlers[args.command.command](args);
 });
 
 /**
@@ -87,7 +150,13 @@ app.command('/schedule-help', async ({ ack, say }) => {
  */
 app.action('complete_task', async ({ body, ack, client }) => {
   await ack();
+  runInBackground('Task completion', () => completeTask(body, client));
+});
 
+/**
+ * Mark the clicked task complete and confirm to the user
+ */
+async function completeTask(body, client) {
   try {
     // Parse the task info from button value
     const taskInfo = JSON.parse(body.actions[0].value);
@@ -95,24 +164,28 @@ app.action('complete_task', async ({ body, ack, client }) => {
     // Update the message to show completion
     await slackService.markTaskComplete(client, body, taskInfo);
     
-    // Send confirmation
-    await client.chat.postEphemeral({
-      channel: body.channel.id,
-      user: body.user.id,
+    // Send confirmation, batched with any other completions in this frame
+    await messageBatcher.enqueue(client, { channel: body.channel.id, user: body.user.id }, {
       text: '✅ Task marked as completed! 🎉'
     });
 
   } catch (error) {
-    console.error('Task completion error:', error);
+    logger.error('Task completion error:', error);
   }
-});
+}
 
 /**
  * Handle schedule regeneration
  */
 app.action('regenerate_schedule', async ({ body, ack, client }) => {
   await ack();
+  runInBackground('Regeneration', () => regenerateSchedule(body, client));
+});
 
+/**
+ * Replace a schedule message with a freshly generated schedule
+ */
+async function regenerateSchedule(body, client) {
   try {
     // Show loading state
     await client.chat.update({
@@ -134,7 +207,9 @@ app.action('regenerate_schedule', async ({ body, ack, client }) => {
     const originalData = slackService.extractScheduleData(body.message);
     
     if (originalData) {
-      const newSchedule = await nimService.generateSchedule(originalData.timeframe, originalData.tasks);
+      const newSchedule = await nimService.generateSchedule(originalData.timeframe, originalData.tasks, {
+        bypassCache: true
+      });
       
       await client.chat.update({
         channel: body.channel.id,
@@ -150,7 +225,7 @@ app.action('regenerate_schedule', async ({ body, ack, client }) => {
     }
 
   } catch (error) {
-    console.error('Regeneration error:', error);
+    logger.error('Regeneration error:', error);
     
     await client.chat.update({
       channel: body.channel.id,
@@ -158,13 +233,13 @@ app.action('regenerate_schedule', async ({ body, ack, client }) => {
       text: '❌ Failed to regenerate schedule. Please try creating a new one with `/schedule`.'
     });
   }
-});
+}
 
 /**
  * Global error handler
  */
 app.error(async (error) => {
-  console.error('❌ Slack App Error:', error);
+  logger.error('❌ Slack App Error:', error);
 });
 
 /**
@@ -173,26 +248,133 @@ app.error(async (error) => {
 async function start() {
   try {
     await app.start();
-    console.log(`⚡️ NIM Slack Bot is running on port ${config.port}!`);
-    console.log(`🔗 Make sure your Slack app's Request URL points to: http://your-domain.com:${config.port}/slack/events`);
+
+    if (config.slack.socketMode) {
+      logger.info('⚡️ NIM Slack Bot is connected via Socket Mode!');
+    } else {
+      logger.info('⚡️ NIM Slack Bot is running on port %s!', config.port);
+      logger.info('🔗 Make sure your Slack app\'s Request URL points to: http://your-domain.com:%s/slack/events', config.port);
+    }
   } catch (error) {
-    console.error('❌ Failed to start app:', error);
+    logger.error('❌ Failed to start app:', error);
     process.exit(1);
   }
 }
 
 /**
  * Graceful shutdown
+ *
+ * Stops taking events, lets in-flight work finish and closes connections,
+ * giving up after SHUTDOWN_TIMEOUT_MS so a stuck request can't hang exit.
+ * Exits non-zero if draining failed or timed out.
  */
-process.on('SIGINT', async () => {
-  console.log('\n👋 Shutting down gracefully...');
-  await app.stop();
-  process.exit(0);
-});
+const SHUTDOWN_TIMEOUT_MS = 10 * 1000;
+let stopping = false;
+
+async function shutdown() {
+  if (stopping) return;
+  stopping = true;
+
+  logger.info('\n👋 Shutting down gracefully...');
+
+  const drain = (async () => {
+    await app.stop();
+    await Promise.allSettled([...backgroundTasks]);
+    await messageBatcher.flushAll();
+    await responseCache.close();
+    nimService.close();
+  })();
+
+  let timer;
+  const deadline = new Promise(resolve => {
+    timer = setTimeout(resolve, SHUTDOWN_TIMEOUT_MS, 'timeout');
+  });
+
+  const outcome = await Promise.race([
+    drain.then(() => 'done', error => {
+      logger.error('❌ Shutdown error:', error);
+      return 'error';
+    }),
+    deadline
+  ]);
+  clearTimeout(timer);
+
+  if (outcome === 'timeout') {
+    logger.warn('⚠️ Shutdown timed out after %sms, exiting', SHUTDOWN_TIMEOUT_MS);
+  }
+  process.exit(outcome === 'done' ? 0 : 1);
+}
+
+/**
+ * Fork WORKERS processes sharing the port and replace any that crash
+ *
+ * Restarts back off while workers keep dying right after starting, and the
+ * primary gives up after MAX_FAST_FAILURES so a bad port or token can't
+ * cause an endless fork loop.
+ */
+const RESTART_DELAY_MS = 1000;
+const MAX_RESTART_DELAY_MS = 30 * 1000;
+const FAST_FAILURE_MS = 10 * 1000; // Workers dying sooner than this count as startup failures
+const MAX_FAST_FAILURES = 5;
+
+function startCluster() {
+  const startedAt = new Map();
+  let shuttingDown = false;
+  let exitCode = 0;
+  let fastFailures = 0;
+
+  const fork = () => {
+    const worker = cluster.fork();
+    startedAt.set(worker.id, Date.now());
+  };
+
+  const stopWorkers = signal => {
+    shuttingDown = true;
+    if (startedAt.size === 0) process.exit(exitCode);
+    Object.values(cluster.workers).forEach(worker => worker.process.kill(signal));
+  };
+
+  logger.info('🧵 Starting %s workers', config.workers);
+  for (let i = 0; i < config.workers; i++) {
+    fork();
+  }
+
+  cluster.on('exit', (worker, code, signal) => {
+    const uptimeMs = Date.now() - startedAt.get(worker.id);
+    startedAt.delete(worker.id);
+
+    if (shuttingDown) {
+      if (startedAt.size === 0) process.exit(exitCode);
+      return;
+    }
+
+    fastFailures = uptimeMs < FAST_FAILURE_MS ? fastFailures + 1 : 0;
+    if (fastFailures >= MAX_FAST_FAILURES) {
+      logger.error('❌ Workers crashed %s times right after starting, giving up', fastFailures);
+      exitCode = 1;
+      stopWorkers('SIGTERM');
+      return;
+    }
+
+    const delayMs = Math.min(RESTART_DELAY_MS * 2 ** fastFailures, MAX_RESTART_DELAY_MS);
+    logger.error('❌ Worker %s exited (%s), restarting in %sms', worker.process.pid, signal || code, delayMs);
+    setTimeout(() => {
+      if (!shuttingDown) fork();
+    }, delayMs);
+  });
+
+  ['SIGINT', 'SIGTERM'].forEach(signal => process.on(signal, () => stopWorkers(signal)));
+}
 
 // Start the bot
 if (require.main === module) {
-  start();
+  if (config.workers > 1 && cluster.isPrimary) {
+    startCluster();
+  } else {
+    process.on('SIGINT', shutdown);
+    process.on('SIGTERM', shutdown);
+    start();
+  }
 }
 
-module.exports = { app }; 
\ No newline at end of file
+module.exports = { app, commandHandlers, shutdown, startCluster };
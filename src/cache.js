@@ -0,0 +1,284 @@
+/**
+ * Response Cache
+ *
+ * Caches expensive NIM generations so identical requests skip the API.
+ * Uses Redis when REDIS_URL is set (requires the optional `redis` package),
+ * otherwise falls back to a simple in-process store. The same store backs
+ * the per-user rate limiter.
+ */
+
+const crypto = require('crypto');
+const config = require('./config');
+const logger = require('./logger');
+
+// Give up on a store call after this long so a Redis outage can't hang requests
+const STORE_TIMEOUT_MS = 200;
+
+/**
+ * Reject if a promise hasn't settled within ms
+ */
+function withTimeout(promise, ms = STORE_TIMEOUT_MS) {
+  let timer;
+  const timeout = new Promise((resolve, reject) => {
+    timer = setTimeout(() => reject(new Error(`Timed out after ${ms}ms`)), ms);
+  });
+  return Promise.race([promise, timeout]).finally(() => clearTimeout(timer));
+}
+
+// Trim, count and record a sliding-window hit atomically
+const SLIDING_WINDOW_SCRIPT = `
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', key, 0, now - window)
+local count = redis.call('ZCARD', key)
+local added = 0
+if count < limit then
+  redis.call('ZADD', key, now, ARGV[4])
+  count = count + 1
+  added = 1
+end
+redis.call('PEXPIRE', key, window)
+local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+return { added, count, tonumber(oldest[2]) or now }
+`;
+
+/**
+ * In-process store with per-entry expiry and a size cap
+ *
+ * Values are kept as-is (no serialization), so cached objects are shared
+ * between callers and must be treated as read-only.
+ */
+class MemoryStore {
+  constructor(maxEntries) {
+    this.maxEntries = maxEntries;
+    this.entries = new Map();
+    this.windows = new Map();
+    this.pruneWindowsAt = maxEntries;
+  }
+
+  async get(key) {
+    const entry = this.entries.get(key);
+    if (!entry) return null;
+
+    if (entry.expiresAt <= Date.now()) {
+      this.entries.delete(key);
+      return null;
+    }
+    return entry.value;
+  }
+
+  async set(key, value, ttlSeconds) {
+    // Drop the oldest entry once full (Map keeps insertion order)
+    this.entries.delete(key);
+    if (this.entries.size >= this.maxEntries) {
+      this.entries.delete(this.entries.keys().next().value);
+    }
+    this.entries.set(key, { value, expiresAt: Date.now() + ttlSeconds * 1000 });
+  }
+
+  async slidingWindow(key, nowMs, windowMs, limit) {
+    const hits = (this.windows.get(key)?.hits || []).filter(ts => ts > nowMs - windowMs);
+    const added = hits.length < limit;
+
+    if (added) hits.push(nowMs);
+
+    if (hits.length > 0) {
+      this.windows.set(key, { hits, expiresAt: hits[hits.length - 1] + windowMs });
+    } else {
+      this.windows.delete(key);
+    }
+
+    if (this.windows.size >= this.pruneWindowsAt) {
+      this.pruneWindows(nowMs);
+    }
+
+    return { added, count: hits.length, oldestMs: hits.length > 0 ? hits[0] : nowMs };
+  }
+
+  /**
+   * Drop windows with no hits left inside them
+   *
+   * Live windows are never evicted, since that would reset a user's count.
+   * The next prune waits until the map has doubled so sweeps stay amortized.
+   */
+  pruneWindows(nowMs) {
+    for (const [key, window] of this.windows) {
+      if (window.expiresAt <= nowMs) this.windows.delete(key);
+    }
+    this.pruneWindowsAt = Math.max(this.maxEntries, this.windows.size * 2);
+  }
+
+  async close() {
+    this.entries.clear();
+    this.windows.clear();
+  }
+}
+
+/**
+ * Redis-backed store shared across processes (values stored as JSON)
+ *
+ * Commands fail fast while Redis is unreachable instead of queueing until
+ * it comes back, so callers can fall through to NIM or fail open.
+ */
+class RedisStore {
+  constructor(url) {
+    const { createClient } = require('redis');
+
+    this.client = createClient({ url, disableOfflineQueue: true });
+    this.client.on('error', error => logger.error('❌ Redis Error:', error.message));
+    this.ready = this.client.connect();
+    this.ready.catch(() => {}); // Keeps reconnecting in the background
+  }
+
+  /**
+   * Run a command if connected, giving up after STORE_TIMEOUT_MS
+   */
+  run(command) {
+    if (!this.client.isReady) {
+      return Promise.reject(new Error('Redis is not connected'));
+    }
+    return withTimeout(command());
+  }
+
+  async get(key) {
+    const cached = await this.run(() => this.client.get(key));
+    return cached !== null ? JSON.parse(cached) : null;
+  }
+
+  async set(key, value, ttlSeconds) {
+    await this.run(() => this.client.set(key, JSON.stringify(value), { EX: ttlSeconds }));
+  }
+
+  async slidingWindow(key, nowMs, windowMs, limit) {
+    const member = `${nowMs}-${Math.random().toString(36).slice(2, 8)}`;
+    const [added, count, oldestMs] = await this.run(() => this.client.eval(SLIDING_WINDOW_SCRIPT, {
+      keys: [key],
+      arguments: [String(nowMs), String(windowMs), String(limit), member]
+    }));
+
+    return { added: added === 1, count, oldestMs };
+  }
+
+  async close() {
+    if (this.client.isReady) {
+      await this.client.quit();
+    } else {
+      await this.client.disconnect().catch(() => {}); // Stop reconnecting
+    }
+  }
+}
+
+/**
+ * Pick the store for the current configuration
+ */
+function createStore() {
+  if (config.cache.redisUrl) {
+    try {
+      return new RedisStore(config.cache.redisUrl);
+    } catch (error) {
+      if (error.code === 'MODULE_NOT_FOUND') {
+        logger.warn('⚠️ REDIS_URL is set but the `redis` package is not installed - using in-memory cache');
+      } else {
+        logger.warn('⚠️ Could not create Redis client (%s) - using in-memory cache', error.message);
+      }
+    }
+  }
+  return new MemoryStore(config.cache.maxEntries);
+}
+
+class ResponseCache {
+  constructor() {
+    this.store = null;
+  }
+
+  /**
+   * Lazily create the store so importing this module never opens a connection
+   */
+  getStore() {
+    if (!this.store) {
+      this.store = createStore();
+    }
+    return this.store;
+  }
+
+  /**
+   * Build a cache key from a namespace and any JSON-serializable parts
+   */
+  buildKey(namespace, parts) {
+    const digest = crypto.createHash('sha256').update(JSON.stringify(parts)).digest('hex');
+    return `${namespace}:${digest}`;
+  }
+
+  /**
+   * Return the cached value for a key, or generate and cache it
+   *
+   * Entries are fresh for ttlSeconds. With staleTtlSeconds they are kept
+   * longer and served (through onStale) if the generator fails with an
+   * error accepted by shouldServeStale.
+   *
+   * @param {string} key - Cache key from buildKey()
+   * @param {Function} generator - Async function producing the value on a miss
+   * @param {Object} options - ttlSeconds, staleTtlSeconds, shouldCache(value),
+   *   shouldServeStale(error), onStale(value, error)
+   * @returns {Promise<*>} Cached or freshly generated value
+   */
+  async getOrGenerate(key, generator, {
+    ttlSeconds,
+    staleTtlSeconds = 0,
+    shouldCache = () => true,
+    shouldServeStale = () => true,
+    onStale = value => value
+  }) {
+    const store = this.getStore();
+    let entry = null;
+
+    try {
+      entry = await withTimeout(store.get(key));
+    } catch (error) {
+      logger.warn('⚠️ Cache read failed:', error.message);
+    }
+
+    if (entry && entry.freshUntil > Date.now()) {
+      return entry.value;
+    }
+
+    let value;
+    try {
+      value = await generator();
+    } catch (error) {
+      if (entry && staleTtlSeconds > 0 && shouldServeStale(error)) {
+        logger.warn('⚠️ Serving stale %s:', key, error.message);
+        return onStale(entry.value, error);
+      }
+      throw error;
+    }
+
+    if (shouldCache(value)) {
+      const freshUntil = Date.now() + ttlSeconds * 1000;
+      try {
+        await withTimeout(store.set(key, { value, freshUntil }, Math.max(ttlSeconds, staleTtlSeconds)));
+      } catch (error) {
+        logger.warn('⚠️ Cache write failed:', error.message);
+      }
+    }
+
+    return value;
+  }
+
+  /**
+   * Close the underlying store connection
+   */
+  async close() {
+    if (this.store) {
+      await this.store.close();
+      this.store = null;
+    }
+  }
+}
+
+module.exports = new ResponseCache();
+module.exports.MemoryStore = MemoryStore;
+module.exports.RedisStore = RedisStore;
+module.exports.withTimeout = withTimeout;
@@ -6,16 +6,43 @@
 
 require('dotenv').config();
 
+/**
+ * Read an integer env var, keeping explicit zeros and ignoring junk
+ */
+function readInt(name, defaultValue) {
+  const parsed = parseInt(process.env[name], 10);
+  return Number.isNaN(parsed) ? defaultValue : parsed;
+}
+
+const TRUE_VALUES = new Set(['true', '1', 'yes', 'on']);
+const FALSE_VALUES = new Set(['false', '0', 'no', 'off']);
+
+/**
+ * Read a boolean env var (true/1/yes/on or false/0/no/off, case-insensitive),
+ * falling back to the default for anything else
+ */
+function readBool(name, defaultValue) {
+  const value = String(process.env[name] ?? '').trim().toLowerCase();
+  if (TRUE_VALUES.has(value)) return true;
+  if (FALSE_VALUES.has(value)) return false;
+  return defaultValue;
+}
+
 const config = {
   // Server settings
-  port: parseInt(process.env.PORT) || 3000,
+  port: readInt('PORT', 3000),
+  workers: readInt('WORKERS', 1), // Processes sharing the port via cluster
   nodeEnv: process.env.NODE_ENV || 'development',
   logLevel: process.env.LOG_LEVEL || 'info',
+  logFormat: process.env.LOG_FORMAT || 'text', // 'text' or 'json'
 
   // Slack configuration
   slack: {
     botToken: process.env.SLACK_BOT_TOKEN,
-    signingSecret: process.env.SLACK_SIGNING_SECRET
+    signingSecret: process.env.SLACK_SIGNING_SECRET,
+    appToken: process.env.SLACK_APP_TOKEN,
+    socketMode: readBool('SLACK_SOCKET_MODE', Boolean(process.env.SLACK_APP_TOKEN)), // On when an app token is set
+    flushIntervalMs: readInt('FLUSH_INTERVAL_MS', 500) // Ephemeral message batching frame
   },
 
   // NVIDIA NIM API configuration
@@ -23,8 +50,26 @@ const config = {
     apiKey: process.env.NVIDIA_NIM_API_KEY,
     endpoint: process.env.NVIDIA_NIM_ENDPOINT,
     model: process.env.NVIDIA_NIM_MODEL || 'llama-2-70b-chat',
-    timeout: parseInt(process.env.NIM_TIMEOUT) || 30000, // 30 seconds
-    maxRetries: parseInt(process.env.NIM_MAX_RETRIES) || 2
+    timeout: readInt('NIM_TIMEOUT', 30000), // 30 seconds
+    maxRetries: readInt('NIM_MAX_RETRIES', 2),
+    stream: readBool('NIM_STREAM', true) // Show progress while NIM generates
+  },
+
+  // Response cache settings
+  cache: {
+    enabled: readBool('CACHE_ENABLED', true),
+    redisUrl: process.env.REDIS_URL, // Optional - in-memory cache when unset
+    maxEntries: 1000,
+    fallbackEnabled: readBool('CACHE_FALLBACK_ENABLED', true), // Serve stale results during NIM outages
+    ttlSeconds: readInt('CACHE_TTL_SECONDS', 3600), // How long a generated schedule stays fresh
+    staleTtlSeconds: readInt('CACHE_STALE_TTL_SECONDS', 86400)
+  },
+
+  // Per-user rate limits (sliding windows)
+  rateLimit: {
+    enabled: readBool('RATE_LIMIT_ENABLED', true),
+    requestsPerMinute: readInt('RATE_LIMIT_REQUESTS_PER_MINUTE', 60),
+    requestsPerHour: readInt('RATE_LIMIT_REQUESTS_PER_HOUR', 500)
   },
 
   // Scheduling settings
@@ -35,13 +80,29 @@ const config = {
   }
 };
 
+/**
+ * Recursively freeze the config so it stays read-only after load
+ */
+function deepFreeze(object) {
+  Object.values(object).forEach(value => {
+    if (value && typeof value === 'object') {
+      deepFreeze(value);
+    }
+  });
+  return Object.freeze(object);
+}
+
+deepFreeze(config);
+
 /**
  * Validate required configuration
  */
 function validateConfig() {
   const required = [
     { key: 'SLACK_BOT_TOKEN', value: config.slack.botToken },
-    { key: 'SLACK_SIGNING_SECRET', value: config.slack.signingSecret },
+    config.slack.socketMode
+      ? { key: 'SLACK_APP_TOKEN', value: config.slack.appToken }
+      : { key: 'SLACK_SIGNING_SECRET', value: config.slack.signingSecret },
     { key: 'NVIDIA_NIM_API_KEY', value: config.nim.apiKey },
     { key: 'NVIDIA_NIM_ENDPOINT', value: config.nim.endpoint }
   ];
@@ -64,7 +125,7 @@ function validateConfig() {
 }
 
 // Validate on load (except in tests)
-if (process.env.NODE_ENV !== 'test') {
+if (config.nodeEnv !== 'test') {
   validateConfig();
 }
 
@@ -0,0 +1,68 @@
+/**
+ * Logger
+ *
+ * Level-filtered logging honoring LOG_LEVEL. Messages use printf-style
+ * placeholders ("%s") and are only formatted when the level is enabled.
+ * Set LOG_FORMAT=json for one JSON object per line.
+ */
+
+const util = require('util');
+const config = require('./config');
+
+const LEVELS = Object.freeze({
+  error: 0,
+  warn: 1,
+  info: 2,
+  debug: 3
+});
+
+class Logger {
+  constructor(level = config.logLevel, format = config.logFormat) {
+    this.threshold = Object.hasOwn(LEVELS, level) ? LEVELS[level] : LEVELS.info;
+    this.json = format === 'json';
+  }
+
+  /**
+   * Check whether a level would be written
+   */
+  isEnabled(level) {
+    return LEVELS[level] <= this.threshold;
+  }
+
+  /**
+   * Format and write a message if its level is enabled
+   */
+  write(level, args) {
+    if (!this.isEnabled(level)) return;
+
+    const message = util.format(...args);
+    const line = this.json
+      ? JSON.stringify({ ts: new Date().toISOString(), level, msg: message })
+      : message;
+
+    if (LEVELS[level] <= LEVELS.warn) {
+      console.error(line);
+    } else {
+      console.log(line);
+    }
+  }
+
+  error(...args) {
+    this.write('error', args);
+  }
+
+  warn(...args) {
+    this.write('warn', args);
+  }
+
+  info(...args) {
+    this.write('info', args);
+  }
+
+  debug(...args) {
+    this.write('debug', args);
+  }
+}
+
+module.exports = new Logger();
+module.exports.Logger = Logger;
@@ -0,0 +1,78 @@
+/**
+ * Message Batcher
+ *
+ * Coalesces ephemeral messages to the same user and channel that arrive
+ * within a short frame into a single chat.postEphemeral call
+ */
+
+const config = require('./config');
+
+// Slack rejects messages with more than 50 blocks
+const MAX_BLOCKS = 50;
+
+class MessageBatcher {
+  constructor(flushIntervalMs = config.slack.flushIntervalMs) {
+    this.flushIntervalMs = flushIntervalMs;
+    this.batches = new Map();
+  }
+
+  /**
+   * Queue an ephemeral message; resolves once its batch has been posted
+   *
+   * @param {Object} client - Slack Web API client
+   * @param {Object} target - channel and user to post to
+   * @param {Object} message - text and optional blocks
+   * @returns {Promise<void>}
+   */
+  enqueue(client, { channel, user }, message) {
+    const key = `${channel}:${user}`;
+    let batch = this.batches.get(key);
+
+    if (!batch) {
+      batch = { client, channel, user, messages: [], waiters: [] };
+      batch.timer = setTimeout(() => this.flush(key), this.flushIntervalMs);
+      this.batches.set(key, batch);
+    }
+
+    batch.messages.push(message);
+    return new Promise((resolve, reject) => batch.waiters.push({ resolve, reject }));
+  }
+
+  /**
+   * Post one batch as a single message
+   */
+  async flush(key) {
+    const batch = this.batches.get(key);
+    if (!batch) return;
+
+    this.batches.delete(key);
+    clearTimeout(batch.timer);
+
+    const blocks = batch.messages.flatMap(message => message.blocks || []);
+    const payload = {
+      channel: batch.channel,
+      user: batch.user,
+      text: batch.messages.map(message => message.text).join('\n')
+    };
+    if (blocks.length > 0) {
+      payload.blocks = blocks.slice(0, MAX_BLOCKS);
+    }
+
+    try {
+      await batch.client.chat.postEphemeral(payload);
+      batch.waiters.forEach(({ resolve }) => resolve());
+    } catch (error) {
+      batch.waiters.forEach(({ reject }) => reject(error));
+    }
+  }
+
+  /**
+   * Post everything still queued (used on shutdown)
+   */
+  async flushAll() {
+    await Promise.all([...this.batches.keys()].map(key => this.flush(key)));
+  }
+}
+
+module.exports = new MessageBatcher();
+module.exports.MessageBatcher = MessageBatcher;
@@ -4,8 +4,15 @@
  * Simple service to generate schedules using your private NIM API
  */
 
+const http = require('http');
+const https = require('https');
 const axios = require('axios');
 const config = require('./config');
+const logger = require('./logger');
+const responseCache = require('./cache');
+
+// Minimum gap between progress callbacks while streaming (chat.update is Tier 3)
+const STREAM_UPDATE_INTERVAL_MS = 2000;
 
 class NIMService {
   constructor() {
@@ -14,6 +21,11 @@ class NIMService {
     this.model = config.nim.model;
     this.timeout = config.nim.timeout;
     this.maxRetries = config.nim.maxRetries;
+
+    // Keep connections to NIM open so calls skip the TCP/TLS handshake
+    const agentOptions = { keepAlive: true, maxSockets: 50, maxFreeSockets: 20 };
+    this.httpAgent = new http.Agent(agentOptions);
+    this.httpsAgent = new https.Agent(agentOptions);
   }
 
   /**
@@ -21,30 +33,53 @@ class NIMService {
    * 
    * @param {string} timeframe - Time window (e.g., "9:00 AM - 5:00 PM")
    * @param {Array} tasks - Array of task objects
+   * @param {Object} options - bypassCache to force a fresh generation,
+   *   onProgress(content) to stream partial output while generating
    * @returns {Promise<Object>} Generated schedule
    */
-  async generateSchedule(timeframe, tasks) {
+  async generateSchedule(timeframe, tasks, { bypassCache = false, onProgress } = {}) {
+    const generate = () => this.requestSchedule(timeframe, tasks, onProgress);
+
+    if (bypassCache || !config.cache.enabled) {
+      return generate();
+    }
+
+    return responseCache.getOrGenerate(this.buildCacheKey(timeframe, tasks), generate, {
+      ttlSeconds: config.cache.ttlSeconds,
+      staleTtlSeconds: config.cache.fallbackEnabled ? config.cache.staleTtlSeconds : 0,
+      shouldCache: schedule => !schedule.error, // Never cache fallback schedules
+      shouldServeStale: error => this.isOutageError(error.cause || error), // Not bad requests or keys
+      onStale: schedule => ({ ...schedule, cached: true })
+    });
+  }
+
+  /**
+   * Request a new schedule from the NIM API
+   */
+  async requestSchedule(timeframe, tasks, onProgress) {
     const prompt = this.buildSchedulePrompt(timeframe, tasks);
     
-    console.log(`🤖 Calling NIM API for ${tasks.length} tasks in timeframe: ${timeframe}`);
+    logger.info('🤖 Calling NIM API for %s tasks in timeframe: %s', tasks.length, timeframe);
 
     try {
-      const response = await this.callNIM(prompt);
+      const response = await this.callNIM(prompt, 1, onProgress);
       const schedule = this.parseScheduleResponse(response);
       
-      console.log(`✅ Generated schedule with ${schedule.schedule?.length || 0} items`);
+      logger.info('✅ Generated schedule with %s items', schedule.schedule?.length || 0);
       return schedule;
 
     } catch (error) {
-      console.error('❌ NIM API Error:', error.message);
-      throw new Error(`Failed to generate schedule: ${error.message}`);
+      logger.error('❌ NIM API Error:', error.message);
+      throw new Error(`Failed to generate schedule: ${error.message}`, { cause: error });
     }
   }
 
   /**
-   * Call the NIM API with retry logic
+   * Call the NIM API with retry logic, streaming when onProgress is given
    */
-  async callNIM(prompt, attempt = 1) {
+  async callNIM(prompt, attempt = 1, onProgress) {
+    const stream = Boolean(onProgress);
+
     try {
       const response = await axios.post(
         `${this.endpoint}/chat/completions`,
@@ -61,30 +96,107 @@ class NIMService {
             }
           ],
           temperature: 0.3,
-          max_tokens: 2000
+          max_tokens: 2000,
+          ...(stream && { stream: true })
         },
         {
           headers: {
             'Authorization': `Bearer ${this.apiKey}`,
             'Content-Type': 'application/json',
-            'Accept': 'application/json'
+            'Accept': stream ? 'text/event-stream' : 'application/json'
           },
-          timeout: this.timeout
+          timeout: this.timeout,
+          httpAgent: this.httpAgent,
+          httpsAgent: this.httpsAgent,
+          ...(stream && { responseType: 'stream' })
         }
       );
 
+      if (stream) {
+        // Endpoints without SSE support ignore stream: true and send plain JSON
+        if (!String(response.headers?.['content-type']).includes('text/event-stream')) {
+          return JSON.parse(await this.readBody(response.data)).choices[0].message.content;
+        }
+        // Awaited so errors partway through the stream are retried too
+        return await this.readStream(response.data, onProgress);
+      }
       return response.data.choices[0].message.content;
 
     } catch (error) {
       if (attempt <= this.maxRetries && this.isRetryableError(error)) {
-        console.log(`⏳ Retrying NIM API call (${attempt}/${this.maxRetries})...`);
+        logger.info('⏳ Retrying NIM API call (%s/%s)...', attempt, this.maxRetries);
         await this.delay(1000 * attempt); // Progressive delay
-        return this.callNIM(prompt, attempt + 1);
+        return this.callNIM(prompt, attempt + 1, onProgress);
       }
       throw error;
     }
   }
 
+  /**
+   * Collect a server-sent event stream of completion deltas
+   *
+   * Calls onProgress with the content so far at most every
+   * STREAM_UPDATE_INTERVAL_MS; progress failures never abort the stream.
+   */
+  async readStream(stream, onProgress) {
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let content = '';
+    let lastUpdate = Date.now();
+
+    for await (const chunk of stream) {
+      buffer += typeof chunk === 'string' ? chunk : decoder.decode(chunk, { stream: true });
+
+      const lines = buffer.split('\n');
+      buffer = lines.pop(); // Keep any partial line for the next chunk
+
+      for (const line of lines) {
+        const data = line.trim();
+        if (!data.startsWith('data:')) continue;
+
+        const payload = data.slice(5).trim();
+        if (payload === '[DONE]') continue;
+
+        content += JSON.parse(payload).choices?.[0]?.delta?.content || '';
+      }
+
+      if (Date.now() - lastUpdate >= STREAM_UPDATE_INTERVAL_MS) {
+        lastUpdate = Date.now();
+        try {
+          await onProgress(content);
+        } catch (error) {
+          logger.warn('⚠️ Progress update failed:', error.message);
+        }
+      }
+    }
+
+    return content;
+  }
+
+  /**
+   * Read a whole response stream into a string
+   */
+  async readBody(stream) {
+    const chunks = [];
+    for await (const chunk of stream) {
+      chunks.push(Buffer.from(chunk));
+    }
+    return Buffer.concat(chunks).toString('utf8');
+  }
+
+  /**
+   * Build a cache key that ignores whitespace, casing and task ids
+   */
+  buildCacheKey(timeframe, tasks) {
+    const normalize = text => String(text).trim().toLowerCase().replace(/\s+/g, ' ');
+
+    return responseCache.buildKey('nim', {
+      model: this.model,
+      timeframe: normalize(timeframe),
+      tasks: tasks.map(task => [normalize(task.description), task.priority, task.type])
+    });
+  }
+
   /**
    * Build the scheduling prompt
    */
@@ -155,8 +267,8 @@ Respond with JSON in this EXACT format:
       return schedule;
 
     } catch (error) {
-      console.error('❌ Failed to parse NIM response:', error.message);
-      console.error('Raw response:', response);
+      logger.error('❌ Failed to parse NIM response:', error.message);
+      logger.error('Raw response:', response);
       
       // Return a fallback schedule
       return this.createFallbackSchedule(response);
@@ -203,6 +315,22 @@ Respond with JSON in this EXACT format:
     return false;
   }
 
+  /**
+   * Check if an error means NIM is unavailable (stale results may be served)
+   */
+  isOutageError(error) {
+    if (this.isRetryableError(error)) return true;
+    return !error.response && Boolean(error.request); // No reply at all: refused, DNS, reset...
+  }
+
+  /**
+   * Close pooled connections (used on shutdown)
+   */
+  close() {
+    this.httpAgent.destroy();
+    this.httpsAgent.destroy();
+  }
+
   /**
    * Simple delay utility
    */
@@ -0,0 +1,110 @@
+/**
+ * Rate Limit Middleware
+ *
+ * Per-user sliding-window limits so a single user can't exhaust the NIM quota
+ */
+
+const config = require('./config');
+const logger = require('./logger');
+const responseCache = require('./cache');
+const { withTimeout } = require('./cache');
+
+const MINUTE_MS = 60 * 1000;
+const HOUR_MS = 60 * MINUTE_MS;
+const MAX_BLOCKED_USERS = 10000;
+
+// Users known to be over a limit, so bursts skip the store round-trip.
+// The rejecting window doesn't record the request, so the block holds until it
+// frees up (an earlier window that accepted the request has still counted it).
+const blockedUntil = new Map();
+
+/**
+ * Remember that a user is blocked until the given time
+ */
+function rememberBlocked(userId, untilMs) {
+  blockedUntil.delete(userId);
+  if (blockedUntil.size >= MAX_BLOCKED_USERS) {
+    blockedUntil.delete(blockedUntil.keys().next().value);
+  }
+  blockedUntil.set(userId, untilMs);
+}
+
+/**
+ * Record a request for a user and check it against both windows
+ *
+ * @param {string} userId - Slack user ID
+ * @param {number} nowMs - Current time in milliseconds
+ * @returns {Promise<Object>} allowed, remaining requests and retryAfterMs
+ */
+async function checkRateLimit(userId, nowMs = Date.now()) {
+  const blockedMs = blockedUntil.get(userId);
+  if (blockedMs !== undefined) {
+    if (blockedMs > nowMs) {
+      return { allowed: false, remaining: 0, retryAfterMs: blockedMs - nowMs };
+    }
+    blockedUntil.delete(userId);
+  }
+
+  const store = responseCache.getStore();
+  const windows = [
+    { key: `rl:${userId}:min`, windowMs: MINUTE_MS, limit: config.rateLimit.requestsPerMinute },
+    { key: `rl:${userId}:hour`, windowMs: HOUR_MS, limit: config.rateLimit.requestsPerHour }
+  ];
+
+  let remaining = Infinity;
+
+  for (const { key, windowMs, limit } of windows) {
+    const { added, count, oldestMs } = await store.slidingWindow(key, nowMs, windowMs, limit);
+
+    if (!added) {
+      const retryAfterMs = Math.max(oldestMs + windowMs - nowMs, 0);
+      rememberBlocked(userId, nowMs + retryAfterMs);
+      return { allowed: false, remaining: 0, retryAfterMs };
+    }
+    remaining = Math.min(remaining, limit - count);
+  }
+
+  return { allowed: true, remaining, retryAfterMs: 0 };
+}
+
+/**
+ * Global Bolt middleware rejecting users over their limit
+ */
+async function rateLimit({ body, ack, next }) {
+  const userId = body.user_id || body.user?.id;
+
+  if (!config.rateLimit.enabled || !userId) {
+    await next();
+    return;
+  }
+
+  let result;
+  try {
+    result = await withTimeout(checkRateLimit(userId));
+  } catch (error) {
+    // Fail open - a cache outage (or a hung store) shouldn't take the bot down
+    logger.warn('⚠️ Rate limit check failed, allowing request:', error.message);
+    await next();
+    return;
+  }
+
+  if (!result.allowed) {
+    const retryIn = Math.ceil(result.retryAfterMs / 1000);
+    logger.info('🚫 Rate limit exceeded for %s', userId);
+
+    if (ack) {
+      await ack(body.command ? {
+        response_type: 'ephemeral',
+        text: `⚠️ Rate limit exceeded, retry in ${retryIn}s`
+      } : undefined);
+    }
+    return;
+  }
+
+  await next();
+}
+
+module.exports = {
+  rateLimit,
+  checkRateLimit
+};
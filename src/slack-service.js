@@ -4,6 +4,104 @@
  * Simple service for formatting and sending Slack messages
  */
 
+const logger = require('./logger');
+
+const PRIORITY_EMOJIS = Object.freeze({
+  high: '🔴',
+  medium: '🟡',
+  low: '🟢'
+});
+
+const TYPE_EMOJIS = Object.freeze({
+  meeting: '👥',
+  learning: '📚',
+  general: '⚡'
+});
+
+/**
+ * Recursively freeze a constant so shared blocks can't be changed by callers
+ */
+function deepFreeze(object) {
+  Object.values(object).forEach(value => {
+    if (value && typeof value === 'object') {
+      deepFreeze(value);
+    }
+  });
+  return Object.freeze(object);
+}
+
+// Constant blocks are built once and shared between messages (deep-frozen)
+const DIVIDER_BLOCK = deepFreeze({ type: 'divider' });
+
+const CACHED_NOTICE_BLOCK = deepFreeze({
+  type: 'context',
+  elements: [
+    {
+      type: 'mrkdwn',
+      text: '⚠️ *Cached result:* NIM is unavailable, showing a schedule generated earlier for the same timeframe and tasks.'
+    }
+  ]
+});
+
+const ERROR_HINT_BLOCK = deepFreeze({
+  type: 'context',
+  elements: [
+    {
+      type: 'mrkdwn',
+      text: 'Try `/schedule-help` for usage examples.'
+    }
+  ]
+});
+
+const HELP_MESSAGE = deepFreeze({
+  text: 'NIM Scheduling Bot Help',
+  blocks: [
+    {
+      type: 'header',
+      text: {
+        type: 'plain_text',
+        text: '🤖 NIM Scheduling Bot Help'
+      }
+    },
+    {
+      type: 'section',
+      text: {
+        type: 'mrkdwn',
+        text: 'I create optimized schedules using AI! Here\'s how:'
+      }
+    },
+    DIVIDER_BLOCK,
+    {
+      type: 'section',
+      text: {
+        type: 'mrkdwn',
+        text: '*📝 Basic Usage:*\n`/schedule [timeframe] [tasks...]`'
+      }
+    },
+    {
+      type: 'section',
+      text: {
+        type: 'mrkdwn',
+        text: '*⏰ Timeframes:*\n• `9AM-5PM` or `09:00-17:00`\n• `morning`, `afternoon`, `workday`'
+      }
+    },
+    {
+      type: 'section',
+      text: {
+        type: 'mrkdwn',
+        text: '*📋 Tasks:*\n`"Description (priority, type)"`\n\n*Priorities:* high, medium, low\n*Types:* general, meeting, learning'
+      }
+    },
+    {
+      type: 'section',
+      text: {
+        type: 'mrkdwn',
+        text: '*💡 Examples:*\n`/schedule 9AM-5PM "Review code (high, general)" "Team standup (medium, meeting)"`\n\n`/schedule morning "Focus work (high, general)" "Learning time (low, learning)"`'
+      }
+    }
+  ]
+});
+
 class SlackService {
   /**
    * Create a formatted schedule message
@@ -18,11 +116,14 @@ class SlackService {
           text: `📅 Your Schedule (${timeframe})`
         }
       },
-      {
-        type: 'divider'
-      }
+      DIVIDER_BLOCK
     ];
 
+    // Flag schedules served from cache while NIM was unavailable
+    if (schedule.cached) {
+      blocks.push(CACHED_NOTICE_BLOCK);
+    }
+
     // Add each scheduled task
     if (schedule.schedule && schedule.schedule.length > 0) {
       schedule.schedule.forEach((item, index) => {
@@ -68,9 +169,7 @@ class SlackService {
     // Add summary if available
     if (schedule.summary) {
       blocks.push(
-        {
-          type: 'divider'
-        },
+        DIVIDER_BLOCK,
         {
           type: 'section',
           fields: [
@@ -110,9 +209,7 @@ class SlackService {
     // Add recommendations if available
     if (schedule.recommendations && schedule.recommendations.length > 0) {
       blocks.push(
-        {
-          type: 'divider'
-        },
+        DIVIDER_BLOCK,
         {
           type: 'section',
           text: {
@@ -141,61 +238,23 @@ class SlackService {
   }
 
   /**
-   * Create help message
+   * Create a progress update from partially streamed schedule JSON
    */
-  createHelpMessage() {
+  createProgressMessage(content, totalTasks) {
+    const placed = Math.min((content.match(/"start_time"/g) || []).length, totalTasks);
+
     return {
-      text: 'NIM Scheduling Bot Help',
-      blocks: [
-        {
-          type: 'header',
-          text: {
-            type: 'plain_text',
-            text: '🤖 NIM Scheduling Bot Help'
-          }
-        },
-        {
-          type: 'section',
-          text: {
-            type: 'mrkdwn',
-            text: 'I create optimized schedules using AI! Here\'s how:'
-          }
-        },
-        {
-          type: 'divider'
-        },
-        {
-          type: 'section',
-          text: {
-            type: 'mrkdwn',
-            text: '*📝 Basic Usage:*\n`/schedule [timeframe] [tasks...]`'
-          }
-        },
-        {
-          type: 'section',
-          text: {
-            type: 'mrkdwn',
-            text: '*⏰ Timeframes:*\n• `9AM-5PM` or `09:00-17:00`\n• `morning`, `afternoon`, `workday`'
-          }
-        },
-        {
-          type: 'section',
-          text: {
-            type: 'mrkdwn',
-            text: '*📋 Tasks:*\n`"Description (priority, type)"`\n\n*Priorities:* high, medium, low\n*Types:* general, meeting, learning'
-          }
-        },
-        {
-          type: 'section',
-          text: {
-            type: 'mrkdwn',
-            text: '*💡 Examples:*\n`/schedule 9AM-5PM "Review code (high, general)" "Team standup (medium, meeting)"`\n\n`/schedule morning "Focus work (high, general)" "Learning time (low, learning)"`'
-          }
-        }
-      ]
+      text: `🤖 Creating your optimized schedule... (${placed}/${totalTasks} tasks placed)`
     };
   }
 
+  /**
+   * Create help message
+   */
+  createHelpMessage() {
+    return HELP_MESSAGE;
+  }
+
   /**
    * Create error message
    */
@@ -210,15 +269,7 @@ class SlackService {
             text: `❌ *Error:* ${error}`
           }
         },
-        {
-          type: 'context',
-          elements: [
-            {
-              type: 'mrkdwn',
-              text: 'Try `/schedule-help` for usage examples.'
-            }
-          ]
-        }
+        ERROR_HINT_BLOCK
       ]
     };
   }
@@ -271,7 +322,7 @@ class SlackService {
       }
 
     } catch (error) {
-      console.error('Failed to mark task complete:', error);
+      logger.error('Failed to mark task complete:', error);
     }
   }
 
@@ -288,24 +339,14 @@ class SlackService {
    * Get emoji for task priority
    */
   getPriorityEmoji(priority) {
-    const emojis = {
-      high: '🔴',
-      medium: '🟡',
-      low: '🟢'
-    };
-    return emojis[priority] || '⚪';
+    return Object.hasOwn(PRIORITY_EMOJIS, priority) ? PRIORITY_EMOJIS[priority] : '⚪';
   }
 
   /**
    * Get emoji for task type
    */
   getTypeEmoji(type) {
-    const emojis = {
-      meeting: '👥',
-      learning: '📚',
-      general: '⚡'
-    };
-    return emojis[type] || '📝';
+    return Object.hasOwn(TYPE_EMOJIS, type) ? TYPE_EMOJIS[type] : '📝';
   }
 }
 
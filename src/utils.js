@@ -4,6 +4,12 @@
  * Simple parsing and validation for the Slack bot
  */
 
+const logger = require('./logger');
+
+// Task attributes accepted in "(priority, type)"
+const VALID_PRIORITIES = new Set(['high', 'medium', 'low']);
+const VALID_TYPES = new Set(['general', 'meeting', 'learning']);
+
 /**
  * Parse the /schedule command input
  * 
@@ -92,16 +98,13 @@ function parseTask(taskStr, taskNum) {
     const params = match[2].split(',').map(p => p.trim().toLowerCase());
 
     // Extract priority and type
-    const validPriorities = ['high', 'medium', 'low'];
-    const validTypes = ['general', 'meeting', 'learning'];
-    
     let priority = 'medium';
     let type = 'general';
 
     params.forEach(param => {
-      if (validPriorities.includes(param)) {
+      if (VALID_PRIORITIES.has(param)) {
         priority = param;
-      } else if (validTypes.includes(param)) {
+      } else if (VALID_TYPES.has(param)) {
         type = param;
       }
     });
@@ -114,7 +117,7 @@ function parseTask(taskStr, taskNum) {
     };
 
   } catch (error) {
-    console.error(`Failed to parse task ${taskNum}:`, error);
+    logger.error('Failed to parse task %s:', taskNum, error);
     return null;
   }
 }
@@ -16,6 +16,7 @@ jest.mock('@slack/bolt', () => ({
       }
     },
     receiver: { start: jest.fn() },
+    use: jest.fn(),
     command: jest.fn(),
     action: jest.fn(),
     error: jest.fn(),
@@ -24,9 +25,18 @@ jest.mock('@slack/bolt', () => ({
   }))
 }));
 
+// Mock cluster so worker management can be tested without forking
+jest.mock('cluster', () => ({
+  isPrimary: true,
+  workers: {},
+  fork: jest.fn(),
+  on: jest.fn()
+}));
+
 // Mock the NIM service to avoid real API calls
 jest.mock('../src/nim-service', () => ({
-  generateSchedule: jest.fn()
+  generateSchedule: jest.fn(),
+  close: jest.fn()
 }));
 
 // Mock the Slack service
@@ -34,6 +44,7 @@ jest.mock('../src/slack-service', () => ({
   createScheduleMessage: jest.fn(),
   createErrorMessage: jest.fn(),
   createHelpMessage: jest.fn(),
+  createProgressMessage: jest.fn(),
   markTaskComplete: jest.fn()
 }));
 
@@ -66,6 +77,274 @@ describe('Slack Bot App Integration', () => {
     });
   });
 
+  // Load a fresh copy so listener registrations are recorded after clearAllMocks
+  const loadApp = () => {
+    let loaded;
+    jest.isolateModules(() => {
+      loaded = {
+        ...require('../src/app'),
+        App: require('@slack/bolt').App,
+        cluster: require('cluster'),
+        nimService: require('../src/nim-service'),
+        messageBatcher: require('../src/message-batcher'),
+        slackService: require('../src/slack-service')
+      };
+    });
+    return loaded;
+  };
+
+  describe('Receiver Mode', () => {
+    test('should use the HTTP receiver without an app token', () => {
+      const { App } = loadApp();
+
+      expect(App).toHaveBeenCalledWith(expect.objectContaining({
+        signingSecret: 'test-signing-secret',
+        socketMode: false
+      }));
+    });
+  });
+
+  describe('Command Dispatch', () => {
+    test('should register a single command listener for all commands', () => {
+      const { app } = loadApp();
+
+      expect(app.command).toHaveBeenCalledTimes(1);
+      const [matcher] = app.command.mock.calls[0];
+      expect(matcher.test('/schedule')).toBe(true);
+      expect(matcher.test('/schedule-help')).toBe(true);
+      expect(matcher.test('/schedule-other')).toBe(false);
+    });
+
+    test('should have a handler for every matched command', () => {
+      const { commandHandlers } = require('../src/app');
+
+      expect(Object.keys(commandHandlers)).toEqual(['/schedule', '/schedule-help']);
+    });
+
+    test('should route /schedule-help to the help message', async () => {
+      const { app, slackService } = loadApp();
+      const [, listener] = app.command.mock.calls[0];
+      const ack = jest.fn();
+      const say = jest.fn();
+
+      slackService.createHelpMessage.mockReturnValue({ text: 'help' });
+      await listener({ command: { command: '/schedule-help' }, ack, say });
+
+      expect(ack).toHaveBeenCalled();
+      expect(say).toHaveBeenCalledWith({ text: 'help' });
+    });
+  });
+
+  describe('Ack First', () => {
+    const flush = async () => {
+      for (let i = 0; i < 10; i++) await new Promise(resolve => setImmediate(resolve));
+    };
+
+    test('should ack /schedule before the schedule is generated', async () => {
+      const { app, nimService, slackService } = loadApp();
+      const [, listener] = app.command.mock.calls[0];
+      const ack = jest.fn();
+      const say = jest.fn().mockResolvedValue({ ts: '123.456' });
+
+      slackService.createProgressMessage.mockReturnValue({ text: 'progress' });
+      nimService.generateSchedule.mockReturnValue(new Promise(() => {})); // Never resolves
+      await listener({
+        command: {
+          command: '/schedule',
+          text: '9AM-5PM "Review code (high, general)"',
+          user_id: 'U123',
+          channel_id: 'C123'
+        },
+        ack,
+        say
+      });
+
+      expect(ack).toHaveBeenCalledTimes(1);
+
+      await flush();
+      expect(nimService.generateSchedule).toHaveBeenCalledTimes(1);
+      expect(app.client.chat.update).not.toHaveBeenCalled();
+    });
+
+    test('should only update progress when another task is placed', async () => {
+      const { app, nimService, slackService } = loadApp();
+      const [, listener] = app.command.mock.calls[0];
+      const say = jest.fn().mockResolvedValue({ ts: '123.456' });
+
+      slackService.createProgressMessage.mockImplementation(content => ({
+        text: `${(content.match(/start_time/g) || []).length} placed`
+      }));
+      slackService.createScheduleMessage.mockReturnValue({ text: 'schedule' });
+      nimService.generateSchedule.mockImplementation(async (timeframe, tasks, { onProgress }) => {
+        for (const content of ['{', '{"start_time"', '{"start_time", "end', '{"start_time", "end_time"']) {
+          await onProgress(content);
+        }
+        return { schedule: [] };
+      });
+
+      await listener({
+        command: {
+          command: '/schedule',
+          text: '9AM-5PM "Review code (high, general)"',
+          user_id: 'U123',
+          channel_id: 'C123'
+        },
+        ack: jest.fn(),
+        say
+      });
+      await flush();
+
+      expect(app.client.chat.update.mock.calls.map(([message]) => message.text)).toEqual(['1 placed', 'schedule']);
+    });
+  });
+
+  describe('Graceful Shutdown', () => {
+    beforeEach(() => {
+      jest.spyOn(console, 'log').mockImplementation(() => {});
+      jest.spyOn(process, 'exit').mockImplementation(() => {});
+    });
+
+    afterEach(() => {
+      jest.useRealTimers();
+      jest.restoreAllMocks();
+    });
+
+    test('should stop the app and exit cleanly', async () => {
+      const { app, shutdown } = loadApp();
+
+      await shutdown();
+
+      expect(app.stop).toHaveBeenCalledTimes(1);
+      expect(process.exit).toHaveBeenCalledWith(0);
+    });
+
+    test('should only shut down once on repeated signals', async () => {
+      const { app, shutdown } = loadApp();
+
+      await Promise.all([shutdown(), shutdown()]);
+
+      expect(app.stop).toHaveBeenCalledTimes(1);
+      expect(process.exit).toHaveBeenCalledTimes(1);
+    });
+
+    test('should wait for in-flight background work before exiting', async () => {
+      const { app, shutdown } = loadApp();
+      const [, listener] = app.action.mock.calls.find(([id]) => id === 'regenerate_schedule');
+      let finishUpdate;
+      const client = {
+        chat: {
+          update: jest.fn()
+            .mockReturnValueOnce(new Promise(resolve => { finishUpdate = resolve; }))
+            .mockResolvedValue({})
+        }
+      };
+
+      await listener({ body: { channel: { id: 'C123' }, message: { ts: '123.456' } }, ack: jest.fn(), client });
+      const stopped = shutdown();
+      await new Promise(resolve => setImmediate(resolve));
+      expect(process.exit).not.toHaveBeenCalled();
+
+      finishUpdate({});
+      await stopped;
+
+      expect(client.chat.update).toHaveBeenCalledTimes(2);
+      expect(process.exit).toHaveBeenCalledWith(0);
+    });
+
+    test('should post pending batched messages before exiting', async () => {
+      const { shutdown, messageBatcher } = loadApp();
+      const client = { chat: { postEphemeral: jest.fn().mockResolvedValue({}) } };
+
+      const sent = messageBatcher.enqueue(client, { channel: 'C123', user: 'U123' }, { text: 'Done!' });
+      await shutdown();
+      await sent;
+
+      expect(client.chat.postEphemeral).toHaveBeenCalledWith({ channel: 'C123', user: 'U123', text: 'Done!' });
+      expect(process.exit).toHaveBeenCalledWith(0);
+    });
+
+    test('should exit non-zero when draining fails', async () => {
+      const { app, shutdown } = loadApp();
+      jest.spyOn(console, 'error').mockImplementation(() => {});
+      app.stop.mockRejectedValue(new Error('receiver error'));
+
+      await shutdown();
+
+      expect(process.exit).toHaveBeenCalledWith(1);
+    });
+
+    test('should give up after the shutdown deadline', async () => {
+      jest.useFakeTimers();
+      jest.spyOn(console, 'error').mockImplementation(() => {});
+      const { app, shutdown } = loadApp();
+      app.stop.mockReturnValue(new Promise(() => {})); // Never finishes
+
+      shutdown();
+      await jest.advanceTimersByTimeAsync(9999);
+      expect(process.exit).not.toHaveBeenCalled();
+
+      await jest.advanceTimersByTimeAsync(1);
+      expect(process.exit).toHaveBeenCalledWith(1);
+    });
+  });
+
+  describe('Cluster', () => {
+    let cluster;
+    let onExit;
+
+    beforeEach(() => {
+      jest.useFakeTimers();
+      jest.spyOn(console, 'log').mockImplementation(() => {});
+      jest.spyOn(console, 'error').mockImplementation(() => {});
+      jest.spyOn(process, 'on').mockImplementation(() => process);
+      jest.spyOn(process, 'exit').mockImplementation(() => {});
+
+      const loaded = loadApp();
+      cluster = loaded.cluster;
+      let nextId = 0;
+      cluster.fork.mockImplementation(() => {
+        nextId += 1;
+        return { id: nextId, process: { pid: 1000 + nextId, kill: jest.fn() } };
+      });
+
+      loaded.startCluster();
+      onExit = cluster.on.mock.calls.find(([event]) => event === 'exit')[1];
+    });
+
+    afterEach(() => {
+      jest.useRealTimers();
+      jest.restoreAllMocks();
+    });
+
+    test('should restart a crashed worker after a delay', () => {
+      expect(cluster.fork).toHaveBeenCalledTimes(1);
+
+      jest.advanceTimersByTime(60 * 1000);
+      onExit(cluster.fork.mock.results[0].value, 1, null);
+      expect(cluster.fork).toHaveBeenCalledTimes(1);
+
+      jest.advanceTimersByTime(1000);
+      expect(cluster.fork).toHaveBeenCalledTimes(2);
+    });
+
+    test('should back off and give up when workers keep crashing at startup', () => {
+      for (let i = 0; i < 4; i++) {
+        onExit(cluster.fork.mock.results[i].value, 1, null);
+        jest.advanceTimersByTime(1000 * 2 ** (i + 1) - 1);
+        expect(cluster.fork).toHaveBeenCalledTimes(i + 1); // Still backing off
+        jest.advanceTimersByTime(1);
+      }
+      expect(cluster.fork).toHaveBeenCalledTimes(5);
+      expect(process.exit).not.toHaveBeenCalled();
+
+      onExit(cluster.fork.mock.results[4].value, 1, null);
+      jest.advanceTimersByTime(30 * 1000);
+
+      expect(cluster.fork).toHaveBeenCalledTimes(5);
+      expect(process.exit).toHaveBeenCalledWith(1);
+    });
+  });
+
   describe('NIM Service Integration', () => {
     test('should handle NIM API success', async () => {
       const mockSchedule = {
@@ -0,0 +1,233 @@
+/**
+ * Tests for the Response Cache
+ *
+ * Uses the in-memory store so no Redis server is required
+ */
+
+jest.mock('../src/config', () => ({
+  cache: {
+    enabled: true,
+    maxEntries: 2,
+    ttlSeconds: 3600
+  }
+}));
+
+// The optional redis client isn't installed in test environments
+jest.mock('redis', () => ({
+  createClient: jest.fn(() => ({
+    isReady: false,
+    on: jest.fn(),
+    connect: jest.fn(() => new Promise(() => {})), // Redis unreachable: keeps retrying
+    get: jest.fn(),
+    disconnect: jest.fn().mockResolvedValue()
+  }))
+}), { virtual: true });
+
+const responseCache = require('../src/cache');
+const { MemoryStore, RedisStore } = require('../src/cache');
+
+describe('Response Cache', () => {
+  beforeEach(async () => {
+    await responseCache.close();
+    jest.spyOn(console, 'error').mockImplementation(() => {});
+  });
+
+  afterEach(() => {
+    jest.restoreAllMocks();
+  });
+
+  describe('getOrGenerate', () => {
+    test('should generate on a miss and serve the cached value afterwards', async () => {
+      const generator = jest.fn().mockResolvedValue({ schedule: [1, 2] });
+      const key = responseCache.buildKey('nim', { prompt: 'same' });
+
+      const first = await responseCache.getOrGenerate(key, generator, { ttlSeconds: 60 });
+      const second = await responseCache.getOrGenerate(key, generator, { ttlSeconds: 60 });
+
+      expect(first).toEqual({ schedule: [1, 2] });
+      expect(second).toEqual({ schedule: [1, 2] });
+      expect(generator).toHaveBeenCalledTimes(1);
+    });
+
+    test('should skip caching when shouldCache rejects the value', async () => {
+      const generator = jest.fn().mockResolvedValue({ error: 'fallback' });
+      const key = responseCache.buildKey('nim', { prompt: 'bad' });
+      const options = { ttlSeconds: 60, shouldCache: value => !value.error };
+
+      await responseCache.getOrGenerate(key, generator, options);
+      await responseCache.getOrGenerate(key, generator, options);
+
+      expect(generator).toHaveBeenCalledTimes(2);
+    });
+
+    test('should propagate generator errors', async () => {
+      const generator = jest.fn().mockRejectedValue(new Error('NIM down'));
+      const key = responseCache.buildKey('nim', { prompt: 'error' });
+
+      await expect(
+        responseCache.getOrGenerate(key, generator, { ttlSeconds: 60 })
+      ).rejects.toThrow('NIM down');
+    });
+
+    test('should regenerate once the entry is no longer fresh', async () => {
+      const now = Date.now();
+      const clock = jest.spyOn(Date, 'now').mockReturnValue(now);
+      const generator = jest.fn().mockResolvedValue({ ok: true });
+      const key = responseCache.buildKey('nim', { prompt: 'expiring' });
+      const options = { ttlSeconds: 60, staleTtlSeconds: 3600 };
+
+      await responseCache.getOrGenerate(key, generator, options);
+      clock.mockReturnValue(now + 61 * 1000);
+      await responseCache.getOrGenerate(key, generator, options);
+
+      expect(generator).toHaveBeenCalledTimes(2);
+    });
+
+    test('should serve the stale value through onStale when generation fails', async () => {
+      const now = Date.now();
+      const clock = jest.spyOn(Date, 'now').mockReturnValue(now);
+      const key = responseCache.buildKey('nim', { prompt: 'outage' });
+      const options = {
+        ttlSeconds: 60,
+        staleTtlSeconds: 3600,
+        onStale: value => ({ ...value, cached: true })
+      };
+
+      await responseCache.getOrGenerate(key, jest.fn().mockResolvedValue({ schedule: [1] }), options);
+      clock.mockReturnValue(now + 61 * 1000);
+
+      const result = await responseCache.getOrGenerate(
+        key, jest.fn().mockRejectedValue(new Error('NIM 503')), options
+      );
+
+      expect(result).toEqual({ schedule: [1], cached: true });
+    });
+
+    test('should not serve stale values for errors rejected by shouldServeStale', async () => {
+      const now = Date.now();
+      const clock = jest.spyOn(Date, 'now').mockReturnValue(now);
+      const key = responseCache.buildKey('nim', { prompt: 'bad-key' });
+      const options = {
+        ttlSeconds: 60,
+        staleTtlSeconds: 3600,
+        shouldServeStale: error => error.message !== 'NIM 401'
+      };
+
+      await responseCache.getOrGenerate(key, jest.fn().mockResolvedValue({ schedule: [1] }), options);
+      clock.mockReturnValue(now + 61 * 1000);
+
+      await expect(
+        responseCache.getOrGenerate(key, jest.fn().mockRejectedValue(new Error('NIM 401')), options)
+      ).rejects.toThrow('NIM 401');
+    });
+
+    test('should not serve stale values without staleTtlSeconds', async () => {
+      const now = Date.now();
+      const clock = jest.spyOn(Date, 'now').mockReturnValue(now);
+      const key = responseCache.buildKey('nim', { prompt: 'no-fallback' });
+
+      await responseCache.getOrGenerate(key, jest.fn().mockResolvedValue({ ok: true }), { ttlSeconds: 60 });
+      clock.mockReturnValue(now + 61 * 1000);
+
+      await expect(
+        responseCache.getOrGenerate(key, jest.fn().mockRejectedValue(new Error('NIM 503')), { ttlSeconds: 60 })
+      ).rejects.toThrow('NIM 503');
+    });
+
+    test('should still generate when the store hangs', async () => {
+      const store = responseCache.getStore();
+      jest.spyOn(store, 'get').mockReturnValue(new Promise(() => {}));
+      jest.spyOn(store, 'set').mockReturnValue(new Promise(() => {}));
+
+      const generator = jest.fn().mockResolvedValue({ ok: true });
+      const result = await responseCache.getOrGenerate('nim:hung', generator, { ttlSeconds: 60 });
+
+      expect(result).toEqual({ ok: true });
+      expect(generator).toHaveBeenCalledTimes(1);
+    });
+
+    test('should still generate when the store fails', async () => {
+      const store = responseCache.getStore();
+      jest.spyOn(store, 'get').mockRejectedValue(new Error('connection refused'));
+      jest.spyOn(store, 'set').mockRejectedValue(new Error('connection refused'));
+
+      const generator = jest.fn().mockResolvedValue({ ok: true });
+      const result = await responseCache.getOrGenerate('nim:key', generator, { ttlSeconds: 60 });
+
+      expect(result).toEqual({ ok: true });
+    });
+  });
+
+  describe('buildKey', () => {
+    test('should be stable for equal parts', () => {
+      expect(responseCache.buildKey('nim', { a: 1 })).toBe(responseCache.buildKey('nim', { a: 1 }));
+      expect(responseCache.buildKey('nim', { a: 1 })).not.toBe(responseCache.buildKey('nim', { a: 2 }));
+    });
+  });
+
+  describe('MemoryStore', () => {
+    test('should expire entries after their TTL', async () => {
+      const store = new MemoryStore(10);
+      await store.set('key', 'value', 0);
+
+      expect(await store.get('key')).toBeNull();
+    });
+
+    test('should keep values without serializing them', async () => {
+      const store = new MemoryStore(10);
+      const value = { schedule: [{ task: 'Review code' }] };
+      await store.set('key', value, 60);
+
+      expect(await store.get('key')).toBe(value);
+    });
+
+    test('should evict the oldest entry when full', async () => {
+      const store = new MemoryStore(2);
+      await store.set('a', '1', 60);
+      await store.set('b', '2', 60);
+      await store.set('c', '3', 60);
+
+      expect(await store.get('a')).toBeNull();
+      expect(await store.get('b')).toBe('2');
+      expect(await store.get('c')).toBe('3');
+    });
+
+    test('should prune sliding windows that have aged out', async () => {
+      const store = new MemoryStore(2);
+      await store.slidingWindow('rl:a', 1000, 60000, 5);
+      await store.slidingWindow('rl:b', 70000, 60000, 5);
+
+      expect([...store.windows.keys()]).toEqual(['rl:b']);
+    });
+
+    test('should never evict live sliding windows', async () => {
+      const store = new MemoryStore(2);
+      await store.slidingWindow('rl:a', 1000, 60000, 1);
+      await store.slidingWindow('rl:b', 1000, 60000, 5);
+      await store.slidingWindow('rl:c', 2000, 60000, 5);
+
+      expect(store.windows.size).toBe(3);
+      expect((await store.slidingWindow('rl:a', 3000, 60000, 1)).added).toBe(false);
+    });
+
+    test('should report a retry time when the limit is zero', async () => {
+      const store = new MemoryStore(2);
+      const result = await store.slidingWindow('rl:a', 1000, 60000, 0);
+
+      expect(result).toEqual({ added: false, count: 0, oldestMs: 1000 });
+      expect(store.windows.size).toBe(0);
+    });
+  });
+
+  describe('RedisStore', () => {
+    test('should fail fast instead of waiting for a connection', async () => {
+      const store = new RedisStore('redis://localhost:6379');
+
+      await expect(store.get('key')).rejects.toThrow('Redis is not connected');
+      expect(store.client.get).not.toHaveBeenCalled();
+      expect(require('redis').createClient).toHaveBeenCalledWith(expect.objectContaining({
+        disableOfflineQueue: true
+      }));
+    });
+  });
+});
@@ -108,6 +108,83 @@ describe('Configuration', () => {
 
       expect(config.port).toBe(3000); // Should fall back to default
     });
+
+    test('should use HTTP mode without an app token', () => {
+      delete process.env.SLACK_APP_TOKEN;
+      delete process.env.SLACK_SOCKET_MODE;
+
+      delete require.cache[require.resolve('../src/config')];
+      const config = require('../src/config');
+
+      expect(config.slack.socketMode).toBe(false);
+    });
+
+    test('should enable Socket Mode when an app token is set', () => {
+      process.env.SLACK_APP_TOKEN = 'xapp-test-token';
+      delete process.env.SLACK_SOCKET_MODE;
+
+      delete require.cache[require.resolve('../src/config')];
+      const config = require('../src/config');
+
+      expect(config.slack.socketMode).toBe(true);
+      expect(config.slack.appToken).toBe('xapp-test-token');
+    });
+
+    test('should allow forcing HTTP mode with an app token set', () => {
+      process.env.SLACK_APP_TOKEN = 'xapp-test-token';
+      process.env.SLACK_SOCKET_MODE = 'false';
+
+      delete require.cache[require.resolve('../src/config')];
+      const config = require('../src/config');
+
+      expect(config.slack.socketMode).toBe(false);
+    });
+
+    test('should keep explicit zero values', () => {
+      process.env.NIM_MAX_RETRIES = '0';
+
+      delete require.cache[require.resolve('../src/config')];
+      const config = require('../src/config');
+
+      expect(config.nim.maxRetries).toBe(0);
+    });
+
+    test('should read the schedule cache TTL', () => {
+      delete process.env.CACHE_TTL_SECONDS;
+
+      delete require.cache[require.resolve('../src/config')];
+      expect(require('../src/config').cache.ttlSeconds).toBe(3600);
+
+      process.env.CACHE_TTL_SECONDS = '600';
+      delete require.cache[require.resolve('../src/config')];
+      expect(require('../src/config').cache.ttlSeconds).toBe(600);
+    });
+
+    test('should read boolean flags', () => {
+      process.env.CACHE_ENABLED = 'FALSE';
+      delete process.env.RATE_LIMIT_ENABLED;
+
+      delete require.cache[require.resolve('../src/config')];
+      let config = require('../src/config');
+
+      expect(config.cache.enabled).toBe(false);
+      expect(config.rateLimit.enabled).toBe(true);
+
+      process.env.CACHE_ENABLED = '0';
+      process.env.RATE_LIMIT_ENABLED = 'no';
+      process.env.NIM_STREAM = 'off';
+      process.env.CACHE_FALLBACK_ENABLED = 'maybe';
+      process.env.SLACK_SOCKET_MODE = 'Yes';
+
+      delete require.cache[require.resolve('../src/config')];
+      config = require('../src/config');
+
+      expect(config.cache.enabled).toBe(false);
+      expect(config.rateLimit.enabled).toBe(false);
+      expect(config.nim.stream).toBe(false);
+      expect(config.cache.fallbackEnabled).toBe(true); // Unrecognized - keeps the default
+      expect(config.slack.socketMode).toBe(true);
+    });
   });
 
   describe('Configuration Structure', () => {
@@ -136,6 +213,14 @@ describe('Configuration', () => {
       expect(config.nim).toHaveProperty('maxRetries');
     });
 
+    test('should be read-only after loading', () => {
+      const config = require('../src/config');
+
+      expect(Object.isFrozen(config)).toBe(true);
+      expect(Object.isFrozen(config.nim)).toBe(true);
+      expect(Object.isFrozen(config.cache)).toBe(true);
+    });
+
     test('should have reasonable default values', () => {
       const config = require('../src/config');
 
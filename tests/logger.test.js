@@ -0,0 +1,70 @@
+/**
+ * Tests for the Logger
+ */
+
+jest.mock('../src/config', () => ({
+  logLevel: 'info',
+  logFormat: 'text'
+}));
+
+const { Logger } = require('../src/logger');
+
+describe('Logger', () => {
+  beforeEach(() => {
+    jest.spyOn(console, 'log').mockImplementation(() => {});
+    jest.spyOn(console, 'error').mockImplementation(() => {});
+  });
+
+  afterEach(() => {
+    jest.restoreAllMocks();
+  });
+
+  test('should format placeholders when the level is enabled', () => {
+    const logger = new Logger('info', 'text');
+
+    logger.info('📅 Schedule request from %s: %s', 'U1', '9AM-5PM');
+
+    expect(console.log).toHaveBeenCalledWith('📅 Schedule request from U1: 9AM-5PM');
+  });
+
+  test('should skip formatting below the configured level', () => {
+    const logger = new Logger('warn', 'text');
+    const expensive = { toString: jest.fn(() => 'value') };
+
+    logger.info('Value: %s', expensive);
+    logger.debug('Value: %s', expensive);
+
+    expect(console.log).not.toHaveBeenCalled();
+    expect(expensive.toString).not.toHaveBeenCalled();
+  });
+
+  test('should write warnings and errors to stderr', () => {
+    const logger = new Logger('debug', 'text');
+
+    logger.warn('careful');
+    logger.error('broken');
+    logger.debug('details');
+
+    expect(console.error).toHaveBeenCalledWith('careful');
+    expect(console.error).toHaveBeenCalledWith('broken');
+    expect(console.log).toHaveBeenCalledWith('details');
+  });
+
+  test('should emit one JSON object per line in json format', () => {
+    const logger = new Logger('info', 'json');
+
+    logger.info('Processing %s', 'slash_command');
+
+    const entry = JSON.parse(console.log.mock.calls[0][0]);
+    expect(entry).toHaveProperty('level', 'info');
+    expect(entry).toHaveProperty('msg', 'Processing slash_command');
+    expect(entry).toHaveProperty('ts');
+  });
+
+  test('should fall back to info for unknown levels', () => {
+    const logger = new Logger('verbose', 'text');
+
+    expect(logger.isEnabled('info')).toBe(true);
+    expect(logger.isEnabled('debug')).toBe(false);
+  });
+});
@@ -0,0 +1,94 @@
+/**
+ * Tests for the Message Batcher
+ */
+
+jest.mock('../src/config', () => ({
+  slack: {
+    flushIntervalMs: 20
+  }
+}));
+
+const { MessageBatcher } = require('../src/message-batcher');
+
+describe('Message Batcher', () => {
+  let client;
+
+  beforeEach(() => {
+    client = {
+      chat: {
+        postEphemeral: jest.fn().mockResolvedValue({ ok: true })
+      }
+    };
+  });
+
+  test('should coalesce messages in the same frame into one post', async () => {
+    const batcher = new MessageBatcher(20);
+    const target = { channel: 'C1', user: 'U1' };
+
+    await Promise.all([
+      batcher.enqueue(client, target, { text: 'first' }),
+      batcher.enqueue(client, target, { text: 'second' })
+    ]);
+
+    expect(client.chat.postEphemeral).toHaveBeenCalledTimes(1);
+    expect(client.chat.postEphemeral).toHaveBeenCalledWith({
+      channel: 'C1',
+      user: 'U1',
+      text: 'first\nsecond'
+    });
+  });
+
+  test('should concatenate blocks from each message', async () => {
+    const batcher = new MessageBatcher(20);
+    const target = { channel: 'C1', user: 'U1' };
+    const block = text => ({ type: 'section', text: { type: 'mrkdwn', text } });
+
+    await Promise.all([
+      batcher.enqueue(client, target, { text: 'a', blocks: [block('a')] }),
+      batcher.enqueue(client, target, { text: 'b', blocks: [block('b')] })
+    ]);
+
+    expect(client.chat.postEphemeral.mock.calls[0][0].blocks).toEqual([block('a'), block('b')]);
+  });
+
+  test('should batch separately per user and channel', async () => {
+    const batcher = new MessageBatcher(20);
+
+    await Promise.all([
+      batcher.enqueue(client, { channel: 'C1', user: 'U1' }, { text: 'one' }),
+      batcher.enqueue(client, { channel: 'C1', user: 'U2' }, { text: 'two' }),
+      batcher.enqueue(client, { channel: 'C2', user: 'U1' }, { text: 'three' })
+    ]);
+
+    expect(client.chat.postEphemeral).toHaveBeenCalledTimes(3);
+  });
+
+  test('should start a new batch after a flush', async () => {
+    const batcher = new MessageBatcher(20);
+    const target = { channel: 'C1', user: 'U1' };
+
+    await batcher.enqueue(client, target, { text: 'first' });
+    await batcher.enqueue(client, target, { text: 'second' });
+
+    expect(client.chat.postEphemeral).toHaveBeenCalledTimes(2);
+  });
+
+  test('should reject waiters when posting fails', async () => {
+    const batcher = new MessageBatcher(20);
+    client.chat.postEphemeral.mockRejectedValue(new Error('channel_not_found'));
+
+    await expect(
+      batcher.enqueue(client, { channel: 'C1', user: 'U1' }, { text: 'lost' })
+    ).rejects.toThrow('channel_not_found');
+  });
+
+  test('should flush pending batches immediately on flushAll', async () => {
+    const batcher = new MessageBatcher(60 * 1000);
+    const pending = batcher.enqueue(client, { channel: 'C1', user: 'U1' }, { text: 'now' });
+
+    await batcher.flushAll();
+    await pending;
+
+    expect(client.chat.postEphemeral).toHaveBeenCalledTimes(1);
+  });
+});
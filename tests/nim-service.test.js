@@ -4,6 +4,7 @@
  * Tests the NIM API integration with mocked HTTP calls
  */
 
+const { Readable } = require('stream');
 const axios = require('axios');
 const NIMService = require('../src/nim-service');
 
@@ -19,6 +20,9 @@ jest.mock('../src/config', () => ({
     model: 'test-model',
     timeout: 30000,
     maxRetries: 2
+  },
+  cache: {
+    enabled: false
   }
 }));
 
@@ -110,6 +114,21 @@ describe('NIM Service', () => {
       );
     });
 
+    test('should reuse keep-alive agents across calls', async () => {
+      mockedAxios.post.mockResolvedValue({
+        data: { choices: [{ message: { content: JSON.stringify({ schedule: [] }) } }] }
+      });
+
+      const tasks = [{ description: 'Test task', priority: 'medium', type: 'general' }];
+      await NIMService.generateSchedule('9AM-5PM', tasks);
+      await NIMService.generateSchedule('9AM-5PM', tasks);
+
+      const [firstOptions, secondOptions] = mockedAxios.post.mock.calls.map(call => call[2]);
+      expect(firstOptions.httpsAgent).toBe(NIMService.httpsAgent);
+      expect(secondOptions.httpsAgent).toBe(firstOptions.httpsAgent);
+      expect(NIMService.httpsAgent.keepAlive).toBe(true);
+    });
+
     test('should handle JSON response with markdown code blocks', async () => {
       const mockResponse = {
         data: {
@@ -278,6 +297,39 @@ describe('NIM Service', () => {
       // Should only be called once (no retries for 401)
       expect(mockedAxios.post).toHaveBeenCalledTimes(1);
     });
+
+    test('should keep the API error as the cause', async () => {
+      const authError = {
+        response: { status: 401 },
+        message: 'Unauthorized'
+      };
+
+      mockedAxios.post.mockRejectedValue(authError);
+
+      const error = await NIMService.generateSchedule('9AM-5PM', [
+        { description: 'Test task', priority: 'medium', type: 'general' }
+      ]).catch(e => e);
+
+      expect(error.cause).toBe(authError);
+      expect(NIMService.isOutageError(error.cause)).toBe(false);
+    });
+
+    test('should treat an unreachable endpoint as an outage', async () => {
+      const refusedError = {
+        code: 'ECONNREFUSED',
+        request: {},
+        message: 'connect ECONNREFUSED 127.0.0.1:443'
+      };
+
+      mockedAxios.post.mockRejectedValue(refusedError);
+
+      const error = await NIMService.generateSchedule('9AM-5PM', [
+        { description: 'Test task', priority: 'medium', type: 'general' }
+      ]).catch(e => e);
+
+      expect(error.cause).toBe(refusedError);
+      expect(NIMService.isOutageError(error.cause)).toBe(true);
+    });
   });
 
   describe('buildSchedulePrompt', () => {
@@ -305,6 +357,145 @@ describe('NIM Service', () => {
     });
   });
 
+  describe('streaming', () => {
+    const sse = (...deltas) => deltas
+      .map(content => `data: ${JSON.stringify({ choices: [{ delta: { content } }] })}\n\n`)
+      .concat('data: [DONE]\n\n');
+    const sseHeaders = { 'content-type': 'text/event-stream; charset=utf-8' };
+
+    test('should request a stream and parse the streamed schedule', async () => {
+      const schedule = JSON.stringify({
+        schedule: [{ task_id: 1, start_time: '09:00', end_time: '10:00', task: 'Review code' }]
+      });
+      mockedAxios.post.mockResolvedValue({
+        headers: sseHeaders,
+        data: Readable.from(sse(schedule.slice(0, 20), schedule.slice(20)))
+      });
+
+      const result = await NIMService.generateSchedule('9AM-5PM', [
+        { description: 'Review code', priority: 'high', type: 'general' }
+      ], { onProgress: jest.fn() });
+
+      expect(result.schedule[0]).toHaveProperty('task', 'Review code');
+      expect(mockedAxios.post).toHaveBeenCalledWith(
+        'https://test-nim-endpoint.com/chat/completions',
+        expect.objectContaining({ stream: true }),
+        expect.objectContaining({ responseType: 'stream' })
+      );
+    });
+
+    test('should fall back to a JSON body when the endpoint ignores streaming', async () => {
+      const schedule = JSON.stringify({
+        schedule: [{ task_id: 1, start_time: '09:00', end_time: '10:00', task: 'Review code' }]
+      });
+      const body = JSON.stringify({ choices: [{ message: { content: schedule } }] });
+      mockedAxios.post.mockResolvedValue({
+        headers: { 'content-type': 'application/json' },
+        data: Readable.from([Buffer.from(body.slice(0, 30)), Buffer.from(body.slice(30))])
+      });
+      const onProgress = jest.fn();
+
+      const result = await NIMService.generateSchedule('9AM-5PM', [
+        { description: 'Review code', priority: 'high', type: 'general' }
+      ], { onProgress });
+
+      expect(result.error).toBeUndefined();
+      expect(result.schedule[0]).toHaveProperty('task', 'Review code');
+      expect(onProgress).not.toHaveBeenCalled();
+    });
+
+    test('should retry when the stream fails partway through', async () => {
+      jest.spyOn(NIMService, 'delay').mockResolvedValue();
+      async function* abortedStream() {
+        yield sse('{"schedule": [')[0];
+        throw Object.assign(new Error('stream aborted'), { code: 'ECONNABORTED' });
+      }
+      mockedAxios.post.mockImplementation(async () => ({ headers: sseHeaders, data: abortedStream() }));
+
+      await expect(
+        NIMService.generateSchedule('9AM-5PM', [
+          { description: 'Review code', priority: 'high', type: 'general' }
+        ], { onProgress: jest.fn() })
+      ).rejects.toThrow('Failed to generate schedule');
+
+      expect(mockedAxios.post).toHaveBeenCalledTimes(3);
+    });
+
+    test('should not stream without a progress callback', async () => {
+      mockedAxios.post.mockResolvedValue({
+        data: { choices: [{ message: { content: JSON.stringify({ schedule: [] }) } }] }
+      });
+
+      await NIMService.generateSchedule('9AM-5PM', [
+        { description: 'Review code', priority: 'high', type: 'general' }
+      ]);
+
+      const [, body, options] = mockedAxios.post.mock.calls[0];
+      expect(body.stream).toBeUndefined();
+      expect(options.responseType).toBeUndefined();
+    });
+
+    test('should join deltas split across chunks', async () => {
+      const lines = sse('Hello', ', ', 'world').join('');
+      const chunks = [lines.slice(0, 17), lines.slice(17, 50), lines.slice(50)].map(part => Buffer.from(part));
+
+      const content = await NIMService.readStream(Readable.from(chunks), jest.fn());
+
+      expect(content).toBe('Hello, world');
+    });
+
+    test('should throttle progress updates', async () => {
+      let now = 0;
+      jest.spyOn(Date, 'now').mockImplementation(() => now);
+      const onProgress = jest.fn().mockImplementation(async () => {});
+
+      async function* advancingStream() {
+        for (const [chunk, time] of [['a', 100], ['b', 2100], ['c', 2200], ['d', 4200]]) {
+          now = time;
+          yield `data: ${JSON.stringify({ choices: [{ delta: { content: chunk } }] })}\n`;
+        }
+      }
+
+      await NIMService.readStream(advancingStream(), onProgress);
+
+      expect(onProgress.mock.calls).toEqual([['ab'], ['abcd']]);
+    });
+
+    test('should keep streaming when a progress update fails', async () => {
+      jest.spyOn(Date, 'now').mockReturnValueOnce(0).mockReturnValue(5000);
+      const onProgress = jest.fn().mockRejectedValue(new Error('message_not_found'));
+
+      const content = await NIMService.readStream(Readable.from(sse('a', 'b')), onProgress);
+
+      expect(content).toBe('ab');
+    });
+  });
+
+  describe('buildCacheKey', () => {
+    test('should ignore whitespace, casing and task ids', () => {
+      const first = NIMService.buildCacheKey('9AM-5PM', [
+        { id: 'task_1', description: 'Review code', priority: 'high', type: 'general' }
+      ]);
+      const second = NIMService.buildCacheKey(' 9am-5pm ', [
+        { id: 'task_7', description: 'review   CODE', priority: 'high', type: 'general' }
+      ]);
+
+      expect(first).toBe(second);
+      expect(first).toMatch(/^nim:[0-9a-f]{64}$/);
+    });
+
+    test('should differ when task details change', () => {
+      const high = NIMService.buildCacheKey('9AM-5PM', [
+        { description: 'Review code', priority: 'high', type: 'general' }
+      ]);
+      const low = NIMService.buildCacheKey('9AM-5PM', [
+        { description: 'Review code', priority: 'low', type: 'general' }
+      ]);
+
+      expect(high).not.toBe(low);
+    });
+  });
+
   describe('isRetryableError', () => {
     test('should identify retryable errors', () => {
       const retryableErrors = [
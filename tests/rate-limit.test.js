@@ -0,0 +1,173 @@
+/**
+ * Tests for the Rate Limit Middleware
+ *
+ * Runs against the in-memory store so no Redis server is required
+ */
+
+jest.mock('../src/config', () => ({
+  cache: {
+    maxEntries: 100
+  },
+  rateLimit: {
+    enabled: true,
+    requestsPerMinute: 2,
+    requestsPerHour: 3
+  }
+}));
+
+const responseCache = require('../src/cache');
+const { rateLimit, checkRateLimit } = require('../src/rate-limit');
+
+describe('Rate Limit', () => {
+  beforeEach(async () => {
+    await responseCache.close();
+    jest.spyOn(console, 'log').mockImplementation(() => {});
+    jest.spyOn(console, 'error').mockImplementation(() => {});
+  });
+
+  afterEach(() => {
+    jest.restoreAllMocks();
+  });
+
+  describe('checkRateLimit', () => {
+    test('should allow requests up to the per-minute limit', async () => {
+      const now = Date.now();
+
+      const first = await checkRateLimit('U1', now);
+      const second = await checkRateLimit('U1', now + 1);
+      const third = await checkRateLimit('U1', now + 2);
+
+      expect(first).toEqual({ allowed: true, remaining: 1, retryAfterMs: 0 });
+      expect(second.allowed).toBe(true);
+      expect(second.remaining).toBe(0);
+      expect(third.allowed).toBe(false);
+      expect(third.retryAfterMs).toBe(60 * 1000 - 2);
+    });
+
+    test('should allow requests again once the window slides', async () => {
+      const now = Date.now();
+
+      await checkRateLimit('U2', now);
+      await checkRateLimit('U2', now);
+
+      const later = await checkRateLimit('U2', now + 60 * 1000 + 1);
+      expect(later.allowed).toBe(true);
+    });
+
+    test('should enforce the per-hour limit', async () => {
+      const now = Date.now();
+      const minute = 60 * 1000 + 1;
+
+      await checkRateLimit('U3', now);
+      await checkRateLimit('U3', now + minute);
+      await checkRateLimit('U3', now + 2 * minute);
+
+      const result = await checkRateLimit('U3', now + 3 * minute);
+      expect(result.allowed).toBe(false);
+    });
+
+    test('should reject blocked users without hitting the store', async () => {
+      const now = Date.now();
+      const store = responseCache.getStore();
+
+      await checkRateLimit('U10', now);
+      await checkRateLimit('U10', now);
+      await checkRateLimit('U10', now + 1);
+
+      const slidingWindow = jest.spyOn(store, 'slidingWindow');
+      const result = await checkRateLimit('U10', now + 1000);
+
+      expect(result.allowed).toBe(false);
+      expect(result.retryAfterMs).toBe(60 * 1000 - 1000);
+      expect(slidingWindow).not.toHaveBeenCalled();
+    });
+
+    test('should check the store again once the block expires', async () => {
+      const now = Date.now();
+
+      await checkRateLimit('U11', now);
+      await checkRateLimit('U11', now);
+      await checkRateLimit('U11', now);
+
+      const result = await checkRateLimit('U11', now + 60 * 1000 + 1);
+      expect(result.allowed).toBe(true);
+    });
+
+    test('should track users independently', async () => {
+      const now = Date.now();
+
+      await checkRateLimit('U4', now);
+      await checkRateLimit('U4', now);
+
+      expect((await checkRateLimit('U5', now)).allowed).toBe(true);
+    });
+  });
+
+  describe('rateLimit middleware', () => {
+    test('should call next for allowed requests', async () => {
+      const next = jest.fn();
+
+      await rateLimit({ body: { user_id: 'U6', command: '/schedule' }, context: {}, ack: jest.fn(), next });
+
+      expect(next).toHaveBeenCalledTimes(1);
+    });
+
+    test('should ack with a warning and skip next when over the limit', async () => {
+      const body = { user_id: 'U7', command: '/schedule' };
+      const next = jest.fn();
+      const ack = jest.fn();
+
+      await rateLimit({ body, context: {}, ack, next });
+      await rateLimit({ body, context: {}, ack, next });
+      await rateLimit({ body, context: {}, ack, next });
+
+      expect(next).toHaveBeenCalledTimes(2);
+      expect(ack).toHaveBeenCalledWith(expect.objectContaining({
+        response_type: 'ephemeral',
+        text: expect.stringContaining('Rate limit exceeded')
+      }));
+      expect(ack.mock.calls[0][0].text).toMatch(/^⚠️ Rate limit exceeded, retry in \d+s$/);
+    });
+
+    test('should read the user from interaction payloads', async () => {
+      const body = { user: { id: 'U8' }, actions: [] };
+      const next = jest.fn();
+      const ack = jest.fn();
+
+      for (let i = 0; i < 3; i++) {
+        await rateLimit({ body, context: {}, ack, next });
+      }
+
+      expect(next).toHaveBeenCalledTimes(2);
+      expect(ack).toHaveBeenCalledWith(undefined);
+    });
+
+    test('should pass through events without a user', async () => {
+      const next = jest.fn();
+
+      await rateLimit({ body: { type: 'url_verification' }, context: {}, next });
+
+      expect(next).toHaveBeenCalledTimes(1);
+    });
+
+    test('should fail open when the store errors', async () => {
+      const store = responseCache.getStore();
+      jest.spyOn(store, 'slidingWindow').mockRejectedValue(new Error('connection refused'));
+      const next = jest.fn();
+
+      await rateLimit({ body: { user_id: 'U9' }, context: {}, ack: jest.fn(), next });
+
+      expect(next).toHaveBeenCalledTimes(1);
+    });
+
+    test('should fail open when the store hangs', async () => {
+      const store = responseCache.getStore();
+      jest.spyOn(store, 'slidingWindow').mockReturnValue(new Promise(() => {}));
+      const next = jest.fn();
+
+      await rateLimit({ body: { user_id: 'U20' }, context: {}, ack: jest.fn(), next });
+
+      expect(next).toHaveBeenCalledTimes(1);
+    });
+  });
+});
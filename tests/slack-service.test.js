@@ -139,6 +139,29 @@ describe('Slack Service', () => {
       expect(result.blocks.length).toBeGreaterThan(0);
     });
 
+    test('should flag schedules served from cache', () => {
+      const mockSchedule = {
+        schedule: [],
+        summary: { total_tasks: 0, total_duration: 0 },
+        cached: true
+      };
+
+      const result = SlackService.createScheduleMessage(mockSchedule, '9AM-5PM');
+
+      // Notice appears right after the header and divider
+      expect(result.blocks[2].type).toBe('context');
+      expect(result.blocks[2].elements[0].text).toContain('Cached result');
+    });
+
+    test('should not flag fresh schedules', () => {
+      const result = SlackService.createScheduleMessage({ schedule: [] }, '9AM-5PM');
+
+      const cachedNotice = result.blocks.find(block =>
+        block.type === 'context' && block.elements[0].text.includes('Cached result')
+      );
+      expect(cachedNotice).toBeUndefined();
+    });
+
     test('should handle empty schedule', () => {
       const mockSchedule = {
         schedule: [],
@@ -159,6 +182,50 @@ describe('Slack Service', () => {
     });
   });
 
+  describe('shared blocks', () => {
+    test('should reuse the prebuilt help message', () => {
+      expect(SlackService.createHelpMessage()).toBe(SlackService.createHelpMessage());
+    });
+
+    test('should deep-freeze shared blocks', () => {
+      const help = SlackService.createHelpMessage();
+      const [, hint] = SlackService.createErrorMessage('Oops').blocks;
+
+      expect(Object.isFrozen(help.blocks)).toBe(true);
+      expect(Object.isFrozen(help.blocks[0].text)).toBe(true);
+      expect(Object.isFrozen(hint.elements[0])).toBe(true);
+      expect(() => help.blocks.push({ type: 'divider' })).toThrow();
+    });
+
+    test('should not leak task blocks between schedule messages', () => {
+      const schedule = {
+        schedule: [{ task_id: 1, start_time: '09:00', end_time: '10:00', duration: 60, task: 'First' }]
+      };
+
+      const first = SlackService.createScheduleMessage(schedule, '9AM-5PM');
+      const second = SlackService.createScheduleMessage({ schedule: [] }, '9AM-5PM');
+
+      expect(first.blocks).not.toBe(second.blocks);
+      expect(second.blocks.some(block => block.accessory?.action_id === 'complete_task')).toBe(false);
+    });
+  });
+
+  describe('createProgressMessage', () => {
+    test('should count tasks placed so far', () => {
+      const partial = '{"schedule": [{"task_id": 1, "start_time": "09:00"}, {"task_id": 2, "start_time": "10';
+
+      const result = SlackService.createProgressMessage(partial, 3);
+
+      expect(result.text).toContain('2/3 tasks placed');
+    });
+
+    test('should never report more tasks than requested', () => {
+      const result = SlackService.createProgressMessage('"start_time" "start_time"', 1);
+
+      expect(result.text).toContain('1/1 tasks placed');
+    });
+  });
+
   describe('createHelpMessage', () => {
     test('should create comprehensive help message', () => {
       const result = SlackService.createHelpMessage();